@@ -13,37 +13,45 @@
 # - 최대 500개 제한:
 #   ✅ 최종 결과(df) 기준으로 500개 초과 시 앞에서 500개만 남김
 
+import io
 import re
 import pandas as pd
 import streamlit as st
-from typing import List, Optional
+from itertools import islice
+from typing import List, Tuple, Union
 
 # ---------------------------
 # 설정
 # ---------------------------
 MAX_REVIEWS = 500  # ✅ 최대로 남길 리뷰 수
+# ✅ Streamlit rerun 시 같은 입력은 다시 파싱하지 않도록 캐시 (크기/수명 제한)
+PARSE_CACHE_MAX_ENTRIES = 32
+PARSE_CACHE_TTL = "15m"
 
 # ---------------------------
 # 공통 유틸
 # ---------------------------
+# 복붙 시 섞여 들어오는 개체 치환 문자(￼, U+FFFC) 제거용
+_OBJ_TRANS = str.maketrans("", "", "\ufffc")
+
 def _normalize_lines(text: str) -> List[str]:
-    lines: List[str] = []
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        line = line.replace("￼", "").strip()
-        if not line:
-            continue
-        lines.append(line)
-    return lines
+    text = text.translate(_OBJ_TRANS)
+    return [s for s in (raw.strip() for raw in text.splitlines()) if s]
+
+# 숫자만 있는 줄 / 구분선(•·-—_)만 있는 줄
+_NOISE_COMMON_RE = re.compile(r"\A(?:\d+|[•·\-\—_]+)\Z")
 
 def _is_noise_line_common(line: str) -> bool:
-    if re.fullmatch(r"\d+", line):
-        return True
-    if re.fullmatch(r"[•·\-\—_]+", line):
-        return True
-    return False
+    return _NOISE_COMMON_RE.match(line) is not None
+
+# ✅ 결과 표 생성: 가능하면 PyArrow 기반 string dtype (groupby/중복 해시가 빠르고 메모리 적음)
+def _make_result_df(authors: List[str], dates: List[str], reviews: List[str]) -> pd.DataFrame:
+    data = {"작성자id": authors, "작성일자": dates, "리뷰내용": reviews}
+    try:
+        return pd.DataFrame(data, dtype="string[pyarrow]")
+    except ImportError:
+        # pyarrow 미설치 환경이면 기본 dtype
+        return pd.DataFrame(data)
 
 # ✅ 추가: 리뷰 첫 단어 추출
 def _first_word(text: str) -> str:
@@ -62,167 +70,173 @@ def _dedupe_keep_second_by_firstword(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
 
-    df = df.copy()
-    df["_first_word"] = df["리뷰내용"].astype(str).apply(_first_word)
-
-    # 그룹 내 순번(0,1,2...) 부여
-    df["_rank"] = df.groupby(["작성자id", "작성일자", "_first_word"]).cumcount()
-    # 그룹 크기
-    df["_gsize"] = df.groupby(["작성자id", "작성일자", "_first_word"])["_rank"].transform("size")
+    # 원본 df 는 복사/수정하지 않고, 중복키 컬럼만 모은 별도 프레임에서 마스크 계산
+    keys = pd.DataFrame({
+        "작성자id": df["작성자id"].to_numpy(),
+        "작성일자": df["작성일자"].to_numpy(),
+        # _first_word 와 동일한 결과를 벡터화로 계산 (행마다 파이썬 함수 호출 방지)
+        "_first_word": df["리뷰내용"].astype(str).str.split(n=1).str[0].fillna("").to_numpy(),
+    })
 
-    keep_mask = ((df["_gsize"] == 1) & (df["_rank"] == 0)) | ((df["_gsize"] >= 2) & (df["_rank"] == 1))
-    df = df.loc[keep_mask].reset_index(drop=True)
+    # 그룹 내 2번째 이후 행 (rank >= 1)
+    later = keys.duplicated(keep="first")
+    # 그 중 그룹별 첫 행 = 원래 그룹의 2번째 행 (rank == 1)
+    second = later.copy()
+    second[later] = ~keys.loc[later].duplicated(keep="first")
+    # 그룹 size == 1 인 행
+    single = ~keys.duplicated(keep=False)
 
-    return df.drop(columns=["_first_word", "_rank", "_gsize"])
+    return df.iloc[(single | second).to_numpy()].reset_index(drop=True)
 
 # ---------------------------
 # JD 입력 전처리 (핵심!)
 # ---------------------------
-def _preclean_jd_text(raw_text: str) -> str:
+def _preclean_jd_text(raw_text: str) -> List[str]:
     """
     JD 복붙 텍스트는 페이지 상단/하단 UI가 같이 들어오는 경우가 많아서,
     파싱 전에 아래를 수행:
     1) 첫 'avatar' 이전 구간은 버림 (상단 UI 제거)
     2) '京东首页' 같은 헤더가 "다시" 등장하면(2번째 등장) 그 지점부터 끝까지 버림 (하단 UI 제거)
        - 네 input처럼 위/아래에 모두 '京东首页'가 있을 때 특히 효과적
+    정리된 라인 리스트를 그대로 반환 (다시 join/split 하지 않도록)
     """
     lines = _normalize_lines(raw_text)
-    if not lines:
-        return ""
 
-    # 1) 첫 avatar 이전 삭제
+    # 1) 첫 avatar 이전 삭제 (list.index 는 C 레벨 스캔, 첫 avatar 에서 멈춤)
     try:
         first_avatar_idx = lines.index("avatar")
-        lines = lines[first_avatar_idx:]
     except ValueError:
         # avatar 자체가 없으면 그대로 반환
-        return "\n".join(lines)
+        return lines
 
-    # 2) '京东首页'가 2번 이상 나오면 2번째부터 끝 삭제
+    # 2) avatar 이후 '京东首页'가 2번 이상 나오면 2번째부터 끝 삭제
+    #    (avatar 뒤쪽만 이어서 스캔 → 전체적으로 한 번의 순회, 2번째 등장에서 멈춤)
     header_key = "京东首页"
-    hit = 0
-    cut_idx = None
-    for idx, line in enumerate(lines):
-        if header_key in line:
-            hit += 1
-            if hit >= 2:
-                cut_idx = idx
-                break
-    if cut_idx is not None:
-        lines = lines[:cut_idx]
+    hits = (k for k in range(first_avatar_idx + 1, len(lines)) if header_key in lines[k])
+    cut_idx = next(islice(hits, 1, None), None)
 
-    return "\n".join(lines)
+    return lines[first_avatar_idx:cut_idx]
 
 # ---------------------------
 # JD (징동) 파서
 # ---------------------------
-JD_DATE_FULL_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-JD_DATE_SHORT_RE = re.compile(r"^\d{2}-\d{2}$")
-
-def parse_jd(text: str, default_year: int = 2026) -> pd.DataFrame:
+JD_MARKER_START = "avatar"
+JD_NOISE_TOKENS = frozenset({"pic", "more", "star", "回复", "有用"})
+JD_DATE_WINDOW = 40  # star 다음 몇 줄 안에서 날짜를 찾을지
+
+# 라인 종류 (한 번만 분류해두고 상태머신에서 재사용)
+_JD_TEXT, _JD_AVATAR, _JD_STAR, _JD_DATE_FULL, _JD_DATE_SHORT, _JD_NOISE, _JD_NOISE_COMMON, _JD_SHOP_REPLY = range(8)
+# 그룹 번호(lastindex) == 라인 종류
+_JD_LINE_RE = re.compile(
+    r"\A(?:"
+    rf"({re.escape(JD_MARKER_START)})"
+    r"|(star)"
+    r"|(\d{4}-\d{2}-\d{2})"
+    r"|(\d{2}-\d{2})"
+    rf"|({'|'.join(map(re.escape, sorted(JD_NOISE_TOKENS - {'star'})))})"
+    r"|(\d+|[•·\-\—_]+)"
+    r"|(商家回复.*)"
+    r")\Z"
+)
+# avatar/star/pic/more/回复/有用/숫자/구분선 → 본문·상품명으로 쓰지 않음
+_JD_NOISE_KINDS = frozenset({_JD_AVATAR, _JD_STAR, _JD_NOISE, _JD_NOISE_COMMON})
+
+# avatar/star/pic/... 처럼 자주 나오는 단독 토큰은 정규식 없이 해시 조회로 분류
+_JD_TOKEN_KINDS = {tok: _JD_NOISE for tok in JD_NOISE_TOKENS}
+_JD_TOKEN_KINDS.update({JD_MARKER_START: _JD_AVATAR, "star": _JD_STAR})
+
+# 상태머신 상태
+_JD_SEEK, _JD_WAIT_STAR, _JD_WAIT_DATE, _JD_PRODUCT, _JD_CONTENT = range(5)
+
+def _jd_line_kind(line: str) -> int:
+    kind = _JD_TOKEN_KINDS.get(line)
+    if kind is not None:
+        return kind
+    m = _JD_LINE_RE.match(line)
+    return m.lastindex if m else _JD_TEXT
+
+@st.cache_data(max_entries=PARSE_CACHE_MAX_ENTRIES, ttl=PARSE_CACHE_TTL)
+def parse_jd(
+    text: str, default_year: int = 2026, return_debug: bool = False
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, List[str]]]:
+    # return_debug=True 이면 (df, 전처리된 라인) 반환 → 디버그 화면에서 전처리 재실행 불필요
     # ✅ 전처리 먼저
-    text = _preclean_jd_text(text)
-    lines = _normalize_lines(text)
-
-    MARKER_START = "avatar"
-    NOISE_TOKENS = {"pic", "more", "star", "回复", "有用"}
-
-    def is_noise_jd(line: str) -> bool:
-        if _is_noise_line_common(line):
-            return True
-        if line in {MARKER_START, *NOISE_TOKENS}:
-            return True
-        return False
-
-    def normalize_jd_date(line: str) -> Optional[str]:
-        if JD_DATE_FULL_RE.match(line):
-            return line
-        if JD_DATE_SHORT_RE.match(line):
-            return f"{default_year}-{line}"
-        return None
-
-    rows = []
+    lines = _preclean_jd_text(text)
+    kinds = [_jd_line_kind(line) for line in lines]
+    n = len(lines)
+
+    # 컬럼별 리스트로 모으고, 본문 join 은 루프 밖에서 한 번에
+    authors: List[str] = []
+    dates: List[str] = []
+    content_chunks: List[List[str]] = []
+
+    # avatar → author → (…) star → (40줄 이내) date → [product] → content* → 다음 avatar / EOF
+    state = _JD_SEEK
+    author = date = None
+    star_idx = 0
+    skip_set = set()
+    content_lines: List[str] = []
     i = 0
 
-    while i < len(lines):
-        if lines[i] != MARKER_START:
-            i += 1
-            continue
-
-        # author
-        if i + 1 >= len(lines):
-            break
-        author = lines[i + 1].strip()
-
-        # star 찾기
-        j = i + 2
-        while j < len(lines) and lines[j] != "star" and lines[j] != MARKER_START:
-            j += 1
-        if j >= len(lines) or lines[j] == MARKER_START:
-            i = j
-            continue
-
-        # date 찾기 (star 다음쪽에서)
-        j += 1
-        date = None
-        date_raw = None
-        steps = 0
-        while j < len(lines) and steps < 40:
-            if lines[j] == MARKER_START:
+    while i < n:
+        line = lines[i]
+        kind = kinds[i]
+
+        if kind == _JD_AVATAR:
+            # 날짜까지 찾은 리뷰면 확정
+            if state in (_JD_PRODUCT, _JD_CONTENT):
+                authors.append(author)
+                dates.append(date)
+                content_chunks.append(content_lines)
+            # author: avatar 바로 다음 줄 (마지막 줄이 avatar 면 종료)
+            if i + 1 >= n:
+                state = _JD_SEEK
                 break
-            nd = normalize_jd_date(lines[j])
-            if nd:
-                date = nd
-                date_raw = lines[j]
-                break
-            j += 1
-            steps += 1
-        if not date:
-            i = j
+            author = lines[i + 1]
+            state = _JD_WAIT_STAR
+            i += 2
             continue
 
-        # product: date 다음 1줄(옵션/상품명)일 수도 있음
-        j += 1
-        product = None
-        if j < len(lines) and lines[j] != MARKER_START and not is_noise_jd(lines[j]):
-            product = lines[j]
-            j += 1
-
-        # 리뷰 본문: 다음 avatar 전까지
-        content_lines = []
-        while j < len(lines):
-            cur = lines[j]
-            if cur == MARKER_START:
-                break
-
-            if cur.startswith("商家回复"):
-                j += 1
-                continue
-
-            # 중복 방지
-            if cur == author:
-                j += 1
-                continue
-            if date_raw and cur == date_raw:
-                j += 1
+        if state == _JD_WAIT_STAR:
+            if kind == _JD_STAR:
+                star_idx = i
+                state = _JD_WAIT_DATE
+
+        elif state == _JD_WAIT_DATE:
+            if i - star_idx > JD_DATE_WINDOW:
+                # 날짜 없음 → 다음 avatar 까지 버림
+                state = _JD_SEEK
+            elif kind == _JD_DATE_FULL or kind == _JD_DATE_SHORT:
+                date = line if kind == _JD_DATE_FULL else f"{default_year}-{line}"
+                # 중복 방지용 (author/date/product 와 같은 줄은 본문에서 제외)
+                skip_set = {author, line}
+                content_lines = []
+                state = _JD_PRODUCT
+
+        elif state == _JD_PRODUCT:
+            # product: date 다음 1줄(옵션/상품명)일 수도 있음
+            state = _JD_CONTENT
+            if kind not in _JD_NOISE_KINDS:
+                skip_set.add(line)
+            else:
+                # product 아님 → 이 줄부터 본문으로 다시 처리
                 continue
-            if product and cur == product:
-                j += 1
-                continue
-
-            if not is_noise_jd(cur):
-                content_lines.append(cur)
 
-            j += 1
+        elif state == _JD_CONTENT:
+            # 리뷰 본문: 商家回复 / 중복 / 노이즈 제외
+            if kind != _JD_SHOP_REPLY and kind not in _JD_NOISE_KINDS and line not in skip_set:
+                content_lines.append(line)
 
-        review = " ".join(content_lines).strip()
-        if not review:
-            review = "내용 없음"
+        i += 1
 
-        rows.append({"작성자id": author, "작성일자": date, "리뷰내용": review})
-        i = j
+    if state in (_JD_PRODUCT, _JD_CONTENT):
+        authors.append(author)
+        dates.append(date)
+        content_chunks.append(content_lines)
 
-    df = pd.DataFrame(rows, columns=["작성자id", "작성일자", "리뷰내용"])
+    # content_lines 는 이미 strip 된 비어있지 않은 줄들이라 join 결과에 strip 불필요
+    reviews = [" ".join(c) or "내용 없음" for c in content_chunks]
+    df = _make_result_df(authors, dates, reviews)
 
     # ✅ 중복 제거 (id, date, first_word) + 두 번째 유지
     df = _dedupe_keep_second_by_firstword(df)
@@ -231,6 +245,8 @@ def parse_jd(text: str, default_year: int = 2026) -> pd.DataFrame:
     if len(df) > MAX_REVIEWS:
         df = df.iloc[:MAX_REVIEWS].reset_index(drop=True)
 
+    if return_debug:
+        return df, lines
     return df
 
 # ---------------------------
@@ -239,88 +255,99 @@ def parse_jd(text: str, default_year: int = 2026) -> pd.DataFrame:
 TMALL_PURCHASE_LINE_RE = re.compile(r"^(20\d{2})年(\d{1,2})月(\d{1,2})日已购：(.+)$")
 TMALL_APPEND_RE = re.compile(r"^\d+天后追评：(.+)$")
 
-def parse_tmall(text: str) -> pd.DataFrame:
-    lines = _normalize_lines(text)
-
-    def is_noise_tmall(line: str) -> bool:
-    # ✅ '有用/回复/更多' 같은 버튼 텍스트는 "단독 라인"일 때만 제거해야 함
-        noise_exact = {"更多", "有用", "回复"}
-
-        # ✅ UI 문구는 포함되면 제거(이건 기존처럼 substring OK)
-        noise_contains = [
-            "为你展示真实评价", "默认排序", "款式筛选",
-        ]
-
-        if line in noise_exact:
-            return True
-        if any(p in line for p in noise_contains):
-            return True
-        if _is_noise_line_common(line):
-            return True
-        if line.startswith("商家回复"):
-            return True
-        return False
+# ✅ '有用/回复/更多' 같은 버튼 텍스트는 "단독 라인"일 때만 제거해야 함
+TMALL_NOISE_EXACT = frozenset({"更多", "有用", "回复"})
+# ✅ UI 문구는 포함되면 제거(이건 기존처럼 substring OK)
+TMALL_NOISE_CONTAINS = ("为你展示真实评价", "默认排序", "款式筛选")
 
-    def normalize_date(y: str, m: str, d: str) -> str:
-        return f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
-
-    def looks_like_author_id(s: str) -> bool:
-        if " " in s:
-            return False
-        if len(s) < 2 or len(s) > 60:
-            return False
-        if TMALL_PURCHASE_LINE_RE.match(s):
-            return False
-        if TMALL_APPEND_RE.match(s):
-            return False
-        if any(x in s for x in ["展示", "排序", "筛选", "已购"]):
-            return False
+def _is_noise_tmall(line: str) -> bool:
+    if line in TMALL_NOISE_EXACT:
+        return True
+    if any(p in line for p in TMALL_NOISE_CONTAINS):
+        return True
+    if _is_noise_line_common(line):
+        return True
+    if line.startswith("商家回复"):
         return True
+    return False
 
-    def is_start_of_next_review(idx: int) -> bool:
-        if not looks_like_author_id(lines[idx]):
-            return False
-        steps = 0
-        j = idx + 1
-        while j < len(lines) and steps < 8:
-            if is_noise_tmall(lines[j]):
-                j += 1
-                steps += 1
-                continue
-            if TMALL_PURCHASE_LINE_RE.match(lines[j]):
-                return True
-            return False
+# 작성자id 로 보기 어려운 UI/구매 문구
+TMALL_AUTHOR_REJECT = ("展示", "排序", "筛选", "已购")
+
+def _looks_like_tmall_author_id(s: str) -> bool:
+    if " " in s:
+        return False
+    if len(s) < 2 or len(s) > 60:
         return False
+    if TMALL_PURCHASE_LINE_RE.match(s):
+        return False
+    if TMALL_APPEND_RE.match(s):
+        return False
+    if any(x in s for x in TMALL_AUTHOR_REJECT):
+        return False
+    return True
+
+def _is_start_of_next_tmall_review(
+    idx: int, is_author_like: List[bool], is_noise: List[bool], is_purchase: List[bool]
+) -> bool:
+    # 작성자 후보 줄 뒤로 노이즈만 (8줄 이내) 지나서 구매 라인이 오면 다음 리뷰 시작
+    if not is_author_like[idx]:
+        return False
+    n = len(is_purchase)
+    j = idx + 1
+    while j < n and (j - idx - 1) < 8 and is_noise[j]:
+        j += 1
+    return j < n and (j - idx - 1) < 8 and is_purchase[j]
+
+@st.cache_data(max_entries=PARSE_CACHE_MAX_ENTRIES, ttl=PARSE_CACHE_TTL)
+def parse_tmall(
+    text: str, return_debug: bool = False
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, List[str]]]:
+    # return_debug=True 이면 (df, 정리된 라인) 반환
+    lines = _normalize_lines(text)
 
-    rows = []
+    # 라인별 분류는 한 번만 (본문 스캔 중 같은 줄에 정규식을 반복 적용하지 않도록)
+    n = len(lines)
+    is_purchase = [TMALL_PURCHASE_LINE_RE.match(line) is not None for line in lines]
+    is_noise = [_is_noise_tmall(line) for line in lines]
+    is_author_like = [_looks_like_tmall_author_id(line) for line in lines]
+
+    # k번째 줄 기준 가장 가까운(<= k) 작성자 후보 줄 위치 (-1: 없음)
+    last_author_idx = [-1] * n
+    cur = -1
+    for k in range(n):
+        if is_author_like[k] and not is_noise[k]:
+            cur = k
+        last_author_idx[k] = cur
+
+    # 컬럼별 리스트로 모아서 DataFrame 한 번에 생성
+    authors: List[str] = []
+    dates: List[str] = []
+    reviews: List[str] = []
     i = 0
 
-    while i < len(lines):
-        m = TMALL_PURCHASE_LINE_RE.match(lines[i])
-        if not m:
+    while i < n:
+        if not is_purchase[i]:
             i += 1
             continue
+        m = TMALL_PURCHASE_LINE_RE.match(lines[i])
 
         y, mo, d, _ = m.groups()
-        date = normalize_date(y, mo, d)
+        date = f"{int(y):04d}-{int(mo):02d}-{int(d):02d}"
 
-        author = "UNKNOWN"
-        for back in [1, 2, 3, 4, 5, 6]:
-            if i - back >= 0:
-                cand = lines[i - back]
-                if looks_like_author_id(cand) and not is_noise_tmall(cand):
-                    author = cand
-                    break
+        # 구매 라인 위쪽 6줄 이내의 작성자 후보 (구매 라인 자체는 후보가 될 수 없음)
+        a_idx = last_author_idx[i]
+        author = lines[a_idx] if a_idx >= 0 and i - a_idx <= 6 else "UNKNOWN"
 
         i += 1
         main_parts = []
         append_parts = []
 
-        while i < len(lines):
+        while i < n:
             line = lines[i]
-            if TMALL_PURCHASE_LINE_RE.match(line):
+            if is_purchase[i]:
                 break
-            if is_start_of_next_review(i):
+            if _is_start_of_next_tmall_review(i, is_author_like, is_noise, is_purchase):
                 break
 
             if line.startswith("商家回复"):
@@ -335,13 +362,14 @@ def parse_tmall(text: str) -> pd.DataFrame:
                 i += 1
                 continue
 
-            if not is_noise_tmall(line):
+            if not is_noise[i]:
                 main_parts.append(line)
 
             i += 1
 
-        main_text = " ".join(main_parts).strip()
-        append_text = " ".join(append_parts).strip()
+        # main_parts / append_parts 는 이미 strip 된 비어있지 않은 조각들
+        main_text = " ".join(main_parts)
+        append_text = " ".join(append_parts)
 
         if append_text and main_text == "该用户未填写评价内容":
             main_text = ""
@@ -355,9 +383,11 @@ def parse_tmall(text: str) -> pd.DataFrame:
         else:
             review = "내용 없음"
 
-        rows.append({"작성자id": author, "작성일자": date, "리뷰내용": review})
+        authors.append(author)
+        dates.append(date)
+        reviews.append(review)
 
-    df = pd.DataFrame(rows, columns=["작성자id", "작성일자", "리뷰내용"])
+    df = _make_result_df(authors, dates, reviews)
 
     # ✅ 중복 제거 (id, date, first_word) + 두 번째 유지
     df = _dedupe_keep_second_by_firstword(df)
@@ -366,19 +396,15 @@ def parse_tmall(text: str) -> pd.DataFrame:
     if len(df) > MAX_REVIEWS:
         df = df.iloc[:MAX_REVIEWS].reset_index(drop=True)
 
+    if return_debug:
+        return df, lines
     return df
 
 # ---------------------------
 # Streamlit UI
 # ---------------------------
-st.set_page_config(page_title="JD/Tmall 리뷰 파서", layout="wide")
-st.title("JD / Tmall 리뷰 텍스트 → 표 변환기")
-st.write("리뷰 텍스트를 복붙하면 **작성자id / 작성일자 / 리뷰내용**으로 파싱해서 표로 보여주고 CSV로 다운로드합니다.")
-
-platform = st.radio("플랫폼 선택", ["징동 (JD)", "티몰 (Tmall)"], horizontal=True)
-
-default_jd = ""
-default_tmall = """N**1
+DEFAULT_JD_TEXT = ""
+DEFAULT_TMALL_TEXT = """N**1
 2025年3月12日已购：框架结构 / 1500mm*2000mm / Elephant床/进口布艺/进口华夫格纯棉全拆床垫
 
 萱**麻
@@ -388,40 +414,53 @@ default_tmall = """N**1
 实物与图片一致美感十足，家具做工十分精致
 """
 
-text = st.text_area(
-    "리뷰 원문 텍스트",
-    value=default_jd if platform.startswith("징동") else default_tmall,
-    height=380
-)
+def main() -> None:
+    st.set_page_config(page_title="JD/Tmall 리뷰 파서", layout="wide")
+    st.title("JD / Tmall 리뷰 텍스트 → 표 변환기")
+    st.write("리뷰 텍스트를 복붙하면 **작성자id / 작성일자 / 리뷰내용**으로 파싱해서 표로 보여주고 CSV로 다운로드합니다.")
+
+    platform = st.radio("플랫폼 선택", ["징동 (JD)", "티몰 (Tmall)"], horizontal=True)
 
-col1, col2 = st.columns([1, 1])
-with col1:
-    do_parse = st.button("파싱 실행", type="primary")
-with col2:
-    show_raw_lines = st.checkbox("디버그: 정리된 라인 보기", value=False)
-
-if do_parse:
-    if platform.startswith("징동"):
-        df = parse_jd(text, default_year=2026)
-    else:
-        df = parse_tmall(text)
-
-    st.subheader("파싱 결과")
-    st.caption(f"총 {len(df)}건 (최대 {MAX_REVIEWS}건 표시)")
-    st.dataframe(df, use_container_width=True)
-
-    csv_bytes = df.to_csv(index=False).encode("utf-8-sig")
-    st.download_button(
-        "CSV 다운로드 (utf-8-sig)",
-        data=csv_bytes,
-        file_name="reviews_parsed.csv",
-        mime="text/csv",
+    text = st.text_area(
+        "리뷰 원문 텍스트",
+        value=DEFAULT_JD_TEXT if platform.startswith("징동") else DEFAULT_TMALL_TEXT,
+        height=380
     )
 
-    if show_raw_lines:
-        st.subheader("디버그: 정리된 라인")
-        # JD 선택일 때만 JD 전처리 적용해서 보여주기
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        do_parse = st.button("파싱 실행", type="primary")
+    with col2:
+        show_raw_lines = st.checkbox("디버그: 정리된 라인 보기", value=False)
+
+    if do_parse:
+        # 디버그 라인은 파서가 이미 만든 것을 그대로 받아서 사용
         if platform.startswith("징동"):
-            st.code("\n".join(_normalize_lines(_preclean_jd_text(text))))
+            parsed = parse_jd(text, default_year=2026, return_debug=show_raw_lines)
         else:
-            st.code("\n".join(_normalize_lines(text)))
+            parsed = parse_tmall(text, return_debug=show_raw_lines)
+        df, debug_lines = parsed if show_raw_lines else (parsed, None)
+
+        st.subheader("파싱 결과")
+        st.caption(f"총 {len(df)}건 (최대 {MAX_REVIEWS}건 표시)")
+        st.dataframe(df, use_container_width=True)
+
+        # str 로 만든 뒤 다시 encode 하지 않고 바로 바이트 버퍼에 기록
+        buf = io.BytesIO()
+        df.to_csv(buf, index=False, encoding="utf-8-sig")
+        csv_bytes = buf.getvalue()
+        st.download_button(
+            "CSV 다운로드 (utf-8-sig)",
+            data=csv_bytes,
+            file_name="reviews_parsed.csv",
+            mime="text/csv",
+        )
+
+        if show_raw_lines:
+            st.subheader("디버그: 정리된 라인")
+            # JD 선택일 때는 JD 전처리까지 적용된 라인
+            st.code("\n".join(debug_lines))
+
+
+if __name__ == "__main__":
+    main()